@@ -23,7 +23,7 @@ import metaheuristic.java_version_migration.migrations.RemoveDoubleLF;
 import java.nio.file.Path;
 import java.util.Comparator;
 import java.util.List;
-import java.util.function.Consumer;
+import java.util.function.BiFunction;
 import java.util.stream.Stream;
 
 /**
@@ -36,7 +36,8 @@ import java.util.stream.Stream;
 public class Migration {
 
     public record MigrationConfig(Path path, Globals globals) {}
-    public record MigrationFunctions(int version, List<Consumer<MigrationConfig>> functions) {}
+    public record Content(String content, boolean changed) {}
+    public record MigrationFunctions(int version, List<BiFunction<MigrationConfig, String, Content>> functions) {}
 
     public static final List<MigrationFunctions> functions = Stream.of(
             new MigrationFunctions(21, List.of(
@@ -16,20 +16,25 @@
 
 package metaheuristic.java_version_migration;
 
-import org.apache.commons.io.file.PathUtils;
-import org.apache.commons.io.filefilter.FileFileFilter;
-import org.apache.commons.io.filefilter.IOFileFilter;
-import org.apache.commons.io.filefilter.SuffixFileFilter;
+import lombok.extern.slf4j.Slf4j;
 
 import java.io.IOException;
+import java.nio.ByteBuffer;
 import java.nio.file.FileVisitOption;
+import java.nio.file.FileVisitResult;
 import java.nio.file.Files;
 import java.nio.file.Path;
+import java.nio.file.SimpleFileVisitor;
+import java.nio.file.StandardOpenOption;
+import java.nio.file.attribute.BasicFileAttributes;
+import java.util.EnumSet;
 import java.util.List;
 import java.util.concurrent.Executors;
 import java.util.concurrent.ThreadPoolExecutor;
+import java.util.concurrent.TimeUnit;
 import java.util.concurrent.atomic.AtomicLong;
-import java.util.stream.Stream;
+import java.util.function.BiFunction;
+import java.util.function.Consumer;
 
 import static metaheuristic.java_version_migration.MigrationUtils.execStat;
 
@@ -38,43 +43,101 @@ import static metaheuristic.java_version_migration.MigrationUtils.execStat;
  * Date: 7/10/2023
  * Time: 8:40 PM
  */
+@Slf4j
 public class MigrationProcessor {
 
     public static final AtomicLong totalSize = new AtomicLong();
+    public static final AtomicLong changedFiles = new AtomicLong();
 
     public static void migrationProcessor(final Globals globals) throws IOException, InterruptedException {
-//        executor = (ThreadPoolExecutor) Executors.newFixedThreadPool(globals.threads);
-        ThreadPoolExecutor executor = (ThreadPoolExecutor) Executors.newFixedThreadPool(1);
-        long mills = System.currentTimeMillis();
+        // threads comes from config as is, newFixedThreadPool() rejects 0 and negative values
+        ThreadPoolExecutor executor = (ThreadPoolExecutor) Executors.newFixedThreadPool(Math.max(1, globals.threads));
+        long nanos = System.nanoTime();
+        // normalize once, not for each found file
+        final List<Path> excludePath = globals.excludePath.stream().map(p->p.toAbsolutePath().normalize()).toList();
+        // the set of migration functions depends only on versions from config, so select it once for all files
+        final List<BiFunction<Migration.MigrationConfig, String, Migration.Content>> functions = Migration.functions.stream()
+                .filter(f-> globals.startJavaVersion < f.version() && f.version() <= globals.targetJavaVersion)
+                .flatMap(f->f.functions().stream())
+                .toList();
         for (Path path : globals.startingPath) {
-            final IOFileFilter filter = FileFileFilter.INSTANCE.and(new SuffixFileFilter(new String[]{".java"}));
-            try (Stream<Path> stream = PathUtils.walk(path, filter, Integer.MAX_VALUE, false, FileVisitOption.FOLLOW_LINKS)) {
-                stream.filter(p-> filterPath(p, globals.excludePath)).forEach(p -> executor.submit(()->process(p, globals)));
-            }
+            findJavaFiles(path, excludePath, p -> executor.submit(()->process(p, globals, functions)));
         }
 
-        MigrationUtils.waitTaskCompleted(executor, 100);
-        long endMills = execStat(mills, executor);
+        final int periodSeconds = 100;
+        MigrationUtils.waitTaskCompleted(executor, periodSeconds);
+        long endNanos = execStat(nanos, executor);
 
-        System.out.println("Total size of files: " + totalSize.get());
+        log.info("Total size of files: {}, changed files: {}", totalSize.get(), changedFiles.get());
 
         int i=0;
     }
 
+    /**
+     * @param excludePath absolute and normalized paths, excluded directories aren't walked at all
+     */
+    public static void findJavaFiles(Path path, List<Path> excludePath, Consumer<Path> consumer) throws IOException {
+        Files.walkFileTree(path, EnumSet.of(FileVisitOption.FOLLOW_LINKS), Integer.MAX_VALUE, new SimpleFileVisitor<>() {
+            @Override
+            public FileVisitResult preVisitDirectory(Path dir, BasicFileAttributes attrs) {
+                return filterPath(dir, excludePath) ? FileVisitResult.CONTINUE : FileVisitResult.SKIP_SUBTREE;
+            }
+
+            @Override
+            public FileVisitResult visitFile(Path file, BasicFileAttributes attrs) {
+                // attributes were read while walking, so there isn't an additional stat() per file
+                if (isJavaFile(file, attrs) && filterPath(file, excludePath)) {
+                    consumer.accept(file);
+                }
+                return FileVisitResult.CONTINUE;
+            }
+        });
+    }
+
+    private static boolean isJavaFile(Path p, BasicFileAttributes attrs) {
+        return attrs.isRegularFile() && p.getFileName().toString().endsWith(".java");
+    }
+
     private static boolean filterPath(Path p, List<Path> excludePath) {
+        if (excludePath.isEmpty()) {
+            return true;
+        }
+        Path path = p.toAbsolutePath().normalize();
+        for (Path exclude : excludePath) {
+            if (path.startsWith(exclude)) {
+                return false;
+            }
+        }
         return true;
     }
 
-    public static void process(Path path, Globals globals) {
+    public static void process(Path path, Globals globals, List<BiFunction<Migration.MigrationConfig, String, Migration.Content>> functions) {
         try {
-            totalSize.addAndGet(Files.size(path));
-            Migration.functions.stream()
-                    .filter(f-> globals.startJavaVersion < f.version() && f.version() <= globals.targetJavaVersion)
-                    .flatMap(f->f.functions().stream())
-                    .forEach(f-> f.accept(new Migration.MigrationConfig(path, globals)));
-
-        } catch (IOException e) {
-            throw new RuntimeException(e);
+            long nanos = System.nanoTime();
+            final Migration.MigrationConfig cfg = new Migration.MigrationConfig(path, globals);
+
+            // file is read and written only once, the content is passed from one migration function to another
+            byte[] bytes = Files.readAllBytes(path);
+            // size is taken from the read bytes, there isn't a separate stat() for it
+            totalSize.addAndGet(bytes.length);
+            // newDecoder() reports malformed input as Files.readString() does, instead of replacing it silently
+            String content = globals.getCharset().newDecoder().decode(ByteBuffer.wrap(bytes)).toString();
+            boolean changed = false;
+            for (BiFunction<Migration.MigrationConfig, String, Migration.Content> function : functions) {
+                Migration.Content newContent = function.apply(cfg, content);
+                if (newContent.changed()) {
+                    content = newContent.content();
+                    changed = true;
+                }
+            }
+            if (changed) {
+                Files.writeString(path, content, globals.getCharset(), StandardOpenOption.SYNC, StandardOpenOption.TRUNCATE_EXISTING, StandardOpenOption.WRITE);
+                // a print for each file serializes workers on System.out, only count it here
+                changedFiles.incrementAndGet();
+                log.debug("{} processed for {}", path, TimeUnit.NANOSECONDS.toMillis(System.nanoTime() - nanos));
+            }
+        } catch (Throwable th) {
+            log.error("Error with path " + path, th);
         }
     }
 
@@ -29,13 +29,15 @@ import java.util.concurrent.TimeUnit;
 @Slf4j
 public class MigrationUtils {
 
-    public static final long SECONDS_MILLIS = TimeUnit.SECONDS.toMillis(1);
-
     public static boolean isInVariable(String content, int start) {
         int lineStart = searchStartLine(content, start);
-        int quoteIdx = content.indexOf("\"", lineStart);
-
-        return quoteIdx!=-1 && quoteIdx<start;
+        // look only at the current line before start, not at the rest of file
+        for (int i = start-1; i >= lineStart; i--) {
+            if (content.charAt(i)=='"') {
+                return true;
+            }
+        }
+        return false;
     }
 
     public static boolean isInComment(String content, int start) {
@@ -50,9 +52,10 @@ public class MigrationUtils {
     }
 
     public static boolean isInCommentLine(String content, int start) {
+        // one backward pass which stops at the first '//' or line break
         for (int i = start; i >= 0; i--) {
             char c = content.charAt(i);
-            if (c=='\n' || c=='\r') {
+            if (isLineBreak(c)) {
                 return false;
             }
             if (c=='/' && i>0 && content.charAt(i-1)=='/') {
@@ -62,24 +65,83 @@ public class MigrationUtils {
         return false;
     }
 
-    @SuppressWarnings("BusyWait")
-    public static void waitTaskCompleted(ThreadPoolExecutor executor, int numberOfPeriods) throws InterruptedException {
-        int i = 0;
-        while ((executor.getTaskCount() - executor.getCompletedTaskCount()) > 0) {
-            Thread.sleep(SECONDS_MILLIS);
-            if (++i % numberOfPeriods == 0) {
-                System.out.print("total: " + executor.getTaskCount() + ", completed: " + executor.getCompletedTaskCount());
-                final Runtime rt = Runtime.getRuntime();
-                System.out.println(", free: " + rt.freeMemory() + ", max: " + rt.maxMemory() + ", total: " + rt.totalMemory());
-                i = 0;
+    /**
+     * if a comment or a string/char literal starts at idx, returns the index right after it,
+     * otherwise returns idx
+     */
+    public static int skipCommentOrLiteral(String content, int idx) {
+        char ch = content.charAt(idx);
+        if (ch=='/' && idx+1<content.length()) {
+            char next = content.charAt(idx+1);
+            if (next=='/') {
+                int end = content.indexOf('\n', idx+2);
+                return end==-1 ? content.length() : end;
             }
+            if (next=='*') {
+                int end = content.indexOf("*/", idx+2);
+                return end==-1 ? content.length() : end+2;
+            }
+            return idx;
         }
+        if (ch=='"') {
+            if (content.startsWith("\"\"\"", idx)) {
+                return skipTextBlock(content, idx);
+            }
+            return skipQuoted(content, idx, '"');
+        }
+        if (ch=='\'') {
+            return skipQuoted(content, idx, '\'');
+        }
+        return idx;
     }
 
-    public static long execStat(long mills, ThreadPoolExecutor executor) {
-        final long curr = System.currentTimeMillis();
+    private static int skipQuoted(String content, int idx, char quote) {
+        for (int i = idx+1; i < content.length(); i++) {
+            char c = content.charAt(i);
+            if (c=='\\') {
+                i++;
+                continue;
+            }
+            if (c==quote) {
+                return i+1;
+            }
+            if (c=='\n') {
+                // unterminated literal, don't go beyond the current line
+                return i;
+            }
+        }
+        return content.length();
+    }
+
+    private static int skipTextBlock(String content, int idx) {
+        for (int i = idx+3; i < content.length(); i++) {
+            char c = content.charAt(i);
+            if (c=='\\') {
+                i++;
+                continue;
+            }
+            if (content.startsWith("\"\"\"", i)) {
+                return i+3;
+            }
+        }
+        return content.length();
+    }
+
+    public static void waitTaskCompleted(ThreadPoolExecutor executor, int periodSeconds) throws InterruptedException {
+        // without shutdown() awaitTermination() never returns true and this loop would print progress forever
+        executor.shutdown();
+        while (!executor.awaitTermination(periodSeconds, TimeUnit.SECONDS)) {
+            System.out.print("total: " + executor.getTaskCount() + ", completed: " + executor.getCompletedTaskCount());
+            final Runtime rt = Runtime.getRuntime();
+            System.out.println(", free: " + rt.freeMemory() + ", max: " + rt.maxMemory() + ", total: " + rt.totalMemory());
+        }
+    }
+
+    public static long execStat(long nanos, ThreadPoolExecutor executor) {
+        // nanoTime() is monotonic, a change of wall clock doesn't affect a measured duration
+        final long curr = System.nanoTime();
         if (log.isInfoEnabled()) {
-            final int sec = (int) ((curr - mills) / 1000);
+            final int sec = (int) TimeUnit.NANOSECONDS.toSeconds(curr - nanos);
             String s = String.format("\nprocessed %d tasks for %d seconds", executor.getTaskCount(), sec);
             if (sec!=0) {
                 s += (", " + (((int) executor.getTaskCount() / sec)) + " tasks/sec");
@@ -90,12 +152,17 @@ public class MigrationUtils {
     }
 
     public static int searchStartLine(String content, int start) {
+        // one backward scan which stops at the first line break of any kind.
+        // lastIndexOf() for '\n' and '\r' separately would scan a whole LF-only file back to 0 looking for '\r'
         for (int i = start-1; i >=0; i--) {
-            char ch = content.charAt(i);
-            if (ch=='\n' || ch=='\r') {
+            if (isLineBreak(content.charAt(i))) {
                 return i;
             }
         }
         return 0;
     }
+
+    private static boolean isLineBreak(char ch) {
+        return ch=='\n' || ch=='\r';
+    }
 }
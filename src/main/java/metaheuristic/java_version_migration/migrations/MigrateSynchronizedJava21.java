@@ -18,18 +18,19 @@ package metaheuristic.java_version_migration.migrations;
 
 import lombok.extern.slf4j.Slf4j;
 import metaheuristic.java_version_migration.Migration;
+import metaheuristic.java_version_migration.Migration.Content;
 import metaheuristic.java_version_migration.MigrationUtils;
 import metaheuristic.java_version_migration.meta.MetaUtils;
 
-import java.nio.file.Files;
-import java.nio.file.Path;
-import java.nio.file.StandardOpenOption;
 import java.util.ArrayList;
 import java.util.List;
 import java.util.regex.Matcher;
 import java.util.regex.Pattern;
 
 import static metaheuristic.java_version_migration.MigrationUtils.isInComment;
+import static metaheuristic.java_version_migration.MigrationUtils.isInCommentBlock;
+import static metaheuristic.java_version_migration.MigrationUtils.isInCommentLine;
+import static metaheuristic.java_version_migration.MigrationUtils.skipCommentOrLiteral;
 
 /**
  * @author Sergio Lissner
@@ -42,6 +43,7 @@ public class MigrateSynchronizedJava21 {
     interface LockerTypeCode {
         String appendDeclarationLockVariables(int idx, int offsetInt);
         String getImport();
+        Pattern getImportPattern();
 
         String getCloseTry(int idx, String offset, String doubleOffset);
         String getOpenTry(int idx, String doubleOffset);
@@ -50,10 +52,13 @@ public class MigrateSynchronizedJava21 {
     public static final ReentrantReadWriteLockCode REENTRANT_READ_WRITE_LOCK_CODE_INSTANCE = new ReentrantReadWriteLockCode();
     public static final StampedLockCode STAMPED_LOCK_CODE_INSTANCE = new StampedLockCode();
 
-    public static final Pattern SYNC_PATTERN = Pattern.compile("\\s+synchronized(\\s+|\\()");
-    public static final Pattern PACKAGE_PATTERN = Pattern.compile("package\\s+");
+    public static final Pattern SYNC_PATTERN = Pattern.compile("\\s+synchronized(?:\\s+|\\()");
+    public static final Pattern PACKAGE_PATTERN = Pattern.compile("^\\s*package\\s+", Pattern.MULTILINE);
 
     public static final String MIGRATE_SYNCHRONIZED_LOCKER = "migrateSynchronizedLocker";
+    public static final String SYNCHRONIZED = "synchronized";
+    // spare capacity of StringBuilder for declarations and try/finally which are inserted into a method
+    private static final int INSERTED_CODE_CAPACITY = 512;
 
     public enum Type {method(false), object(false), comment(true), variable(true);
         public final boolean skip;
@@ -71,58 +76,56 @@ public class MigrateSynchronizedJava21 {
     }
 
     public record Position(int start, int end, Type type) {};
-    public record Content(String content, boolean changed) {};
 
     public static LockerType getLockerType(Migration.MigrationConfig cfg) {
         final String type = MetaUtils.getValue(cfg.globals().metas, MIGRATE_SYNCHRONIZED_LOCKER);
         return type==null ? LockerType.ReentrantReadWriteLock : LockerType.valueOf(type);
     }
 
-    public static void migrateSynchronized(Migration.MigrationConfig cfg) {
-        try {
-            long mills = System.currentTimeMillis();
-            String content = Files.readString(cfg.path(), cfg.globals().getCharset());
-            Content newContent = process(cfg, content);
-            if (newContent.changed) {
-                Files.writeString(cfg.path(), newContent.content, cfg.globals().getCharset(), StandardOpenOption.SYNC, StandardOpenOption.TRUNCATE_EXISTING, StandardOpenOption.WRITE);
-                System.out.println("\t\tprocessed for "+(System.currentTimeMillis() - mills));
-            }
-        } catch (Throwable th) {
-            log.error("Error with path " + cfg.path(), th);
+    public static Content migrateSynchronized(Migration.MigrationConfig cfg, String content) {
+        // most of files don't have synchronized at all, so skip regex scanning of them
+        if (!content.contains(SYNCHRONIZED)) {
+            return new Content(content, false);
         }
-    }
-
-    private static Content process(Migration.MigrationConfig cfg, String content) {
 
-        Path path = cfg.path();
         List<Position> positions = positions(content, true);
         if (positions.isEmpty()) {
             return new Content(content, false);
         }
         LockerType lockerType = getLockerType(cfg);
-        System.out.println(path.toString());
-        positions.forEach(p->System.out.printf("\t%d %d %s\n", p.start, p.end, p.type));
+        if (log.isDebugEnabled()) {
+            Position p = positions.get(0);
+            log.debug("{}\n\t{} {} {}", cfg.path(), p.start, p.end, p.type);
+        }
 
         String code = content;
         int idx = 0;
         boolean changed = false;
         int startOffset = -1;
-        while (!(positions = positions(startOffset, code, true)).isEmpty()) {
+        while (!positions.isEmpty()) {
             Position position = positions.get(0);
             if (position.type.skip) {
-                startOffset = position.start+1;
-                continue;
+                // the next match can't start inside of the current one
+                startOffset = position.end-1;
             }
-            switch (position.type) {
-                case method -> {
-                    code = processAsMethod(lockerType.lockerTypeCode, code, position, idx++, cfg.globals().offset);
-                    changed = true;
-                }
-                case object -> {
-                    code= processAsObject(code, position, idx++, cfg.globals().offset);
-                    startOffset = position.start+1;
+            else {
+                switch (position.type) {
+                    case method -> {
+                        code = processAsMethod(lockerType.lockerTypeCode, code, position, idx, cfg.globals().offset);
+                        // declaration of lock variables was inserted before position.start
+                        // and there isn't any new 'synchronized' till the end of it
+                        startOffset = position.start + lockerType.lockerTypeCode.appendDeclarationLockVariables(idx, cfg.globals().offset).length() - 1;
+                        idx++;
+                        changed = true;
+                    }
+                    case object -> {
+                        code = processAsObject(code, position, idx++, cfg.globals().offset);
+                        startOffset = position.end-1;
+                    }
+                    default -> throw new IllegalStateException("unknown type: " + position.type);
                 }
             }
+            positions = positions(startOffset, code, true);
         }
         if (changed) {
             code = insertImport(lockerType.lockerTypeCode, code);
@@ -130,7 +133,26 @@ public class MigrateSynchronizedJava21 {
         return new Content(code, changed);
     }
 
+    // matches only real import lines, either of the class itself or of the whole package
+    static Pattern importPattern(String className) {
+        return Pattern.compile("^\\s*import\\s+java\\.util\\.concurrent\\.locks\\.(?:" + className + "|\\*)\\s*;", Pattern.MULTILINE);
+    }
+
+    public static boolean hasImport(LockerTypeCode lockerTypeCode, String content) {
+        Matcher m = lockerTypeCode.getImportPattern().matcher(content);
+        while (m.find()) {
+            // an import line inside of /* */ block is commented out too
+            if (!isInCommentBlock(content, m.start())) {
+                return true;
+            }
+        }
+        return false;
+    }
+
     public static String insertImport(LockerTypeCode lockerTypeCode, String content) {
+        if (hasImport(lockerTypeCode, content)) {
+            return content;
+        }
         Matcher m = PACKAGE_PATTERN.matcher(content);
         String code;
         if (m.find()) {
@@ -153,39 +175,41 @@ public class MigrateSynchronizedJava21 {
         return content;
     }
 
-    public static String processAsMethod(LockerTypeCode lockerTypeCode, String content, Position position, int idx, int offset) {
-        String code = appendSecondPart(lockerTypeCode, content, position, idx, offset);
-        code = insertFirstPart(lockerTypeCode, code, position, idx, offset);
-
-        return code;
-    }
-
-    private static String appendSecondPart(LockerTypeCode lockerTypeCode, String content, Position position, int idx, int offset) {
+    public static String processAsMethod(LockerTypeCode lockerTypeCode, String content, Position position, int idx, int offsetInt) {
         int openBracket = findOpenBracket(content, position);
         int closeBracket = findCloseBracket(content, position);
 
-        String code = insertTry(lockerTypeCode, content, openBracket, closeBracket, idx, offset);
-
-        return code;
+        // the same result as insertTry() followed by insertFirstPart(), but content is copied only once
+        StringBuilder sb = new StringBuilder(content.length() + INSERTED_CODE_CAPACITY);
+        appendFirstPart(sb, lockerTypeCode, content, position, idx, offsetInt);
+        appendTry(sb, lockerTypeCode, content, position.end, openBracket, closeBracket, idx, offsetInt);
+        return sb.toString();
     }
 
     public static String insertTry(LockerTypeCode lockerTypeCode, String content, int openBracket, int closeBracket, int idx, int offsetInt) {
+        StringBuilder sb = new StringBuilder(content.length() + INSERTED_CODE_CAPACITY);
+        appendTry(sb, lockerTypeCode, content, 0, openBracket, closeBracket, idx, offsetInt);
+        return sb.toString();
+    }
+
+    // content from 'from' till the end, with the body of method between brackets wrapped in lock/try/finally
+    private static void appendTry(StringBuilder sb, LockerTypeCode lockerTypeCode, String content, int from, int openBracket, int closeBracket, int idx, int offsetInt) {
         String offset = " ".repeat(offsetInt);
         String doubleOffset = " ".repeat(offsetInt*2);
-        String open = lockerTypeCode.getOpenTry(idx, doubleOffset);
-        String close = lockerTypeCode.getCloseTry(idx, offset, doubleOffset);
-
-        String method = content.substring(openBracket+1, closeBracket);
-        return content.substring(0, openBracket+1) +
-               open +
-               method +
-               close +
-               content.substring(closeBracket);
+        sb.append(content, from, openBracket+1)
+                .append(lockerTypeCode.getOpenTry(idx, doubleOffset))
+                .append(content, openBracket+1, closeBracket)
+                .append(lockerTypeCode.getCloseTry(idx, offset, doubleOffset))
+                .append(content, closeBracket, content.length());
     }
 
-
     public static int findOpenBracket(String content, Position position) {
         for (int i = position.end; i < content.length(); i++) {
+            int next = skipCommentOrLiteral(content, i);
+            if (next!=i) {
+                i = next-1;
+                continue;
+            }
             if (content.charAt(i)=='{') {
                 return i;
             }
@@ -196,6 +220,12 @@ public class MigrateSynchronizedJava21 {
     public static int findCloseBracket(String content, Position position) {
         int countOpen = 0;
         for (int i = position.end; i < content.length(); i++) {
+            // brackets inside of comments and literals must not be counted
+            int next = skipCommentOrLiteral(content, i);
+            if (next!=i) {
+                i = next-1;
+                continue;
+            }
             final char ch = content.charAt(i);
             if (ch=='{') {
                 ++countOpen;
@@ -212,18 +242,22 @@ public class MigrateSynchronizedJava21 {
     }
 
     public static String insertFirstPart(LockerTypeCode lockerTypeCode, String content, Position position, int idx, int offset) {
-        int pos = calcPos(content, position);
+        StringBuilder sb = new StringBuilder(content.length() + INSERTED_CODE_CAPACITY);
+        appendFirstPart(sb, lockerTypeCode, content, position, idx, offset);
+        sb.append(content, position.end, content.length());
+
+        return sb.toString();
+    }
 
-        StringBuilder sb = new StringBuilder();
-        sb.append(content, 0, pos);
-        String lock = lockerTypeCode.appendDeclarationLockVariables(idx, offset);
-        sb.append(lock).append(content, pos, position.start);
+    // content till the position of 'synchronized' with declaration of lock variables inserted before the method
+    private static void appendFirstPart(StringBuilder sb, LockerTypeCode lockerTypeCode, String content, Position position, int idx, int offset) {
+        int pos = calcPos(content, position);
+        sb.append(content, 0, pos)
+                .append(lockerTypeCode.appendDeclarationLockVariables(idx, offset))
+                .append(content, pos, position.start);
         if (Character.isWhitespace(content.charAt(position.start))) {
             sb.append(' ');
         }
-        sb.append(content, position.end, content.length());
-
-        return sb.toString();
     }
 
     public static int calcPos(String content, Position position) {
@@ -246,7 +280,12 @@ public class MigrateSynchronizedJava21 {
         for (int i = start-1; i >=0; i--) {
             char ch = content.charAt(i);
             if (ch==';' || ch=='}' || ch=='{') {
-                if (isInComment(content, i)) {
+                if (isInCommentBlock(content, i)) {
+                    // everything back to the opening of comment block is a comment, jump over it
+                    i = content.lastIndexOf("/*", i);
+                    continue;
+                }
+                if (isInCommentLine(content, i)) {
                     continue;
                 }
                 return i;
@@ -274,14 +313,16 @@ public class MigrateSynchronizedJava21 {
     }
 
     public static List<Position> positions(int startOffset, String content, boolean onlyFirst) {
-        Matcher m = SYNC_PATTERN.matcher(content);
         List<Position> positions = new ArrayList<>();
-        while (m.find()) {
+        if (startOffset+1>content.length()) {
+            return positions;
+        }
+        Matcher m = SYNC_PATTERN.matcher(content);
+        // start searching right after startOffset instead of re-scanning content from the beginning
+        boolean found = m.find(startOffset+1);
+        for (; found; found = m.find()) {
             int start = m.start();
             int end = m.end();
-            if (start<=startOffset) {
-                continue;
-            }
             Type type = null;
             if (isInComment(content, start)) {
                 type = Type.comment;;
@@ -290,8 +331,7 @@ public class MigrateSynchronizedJava21 {
                 type = Type.variable;;
             }
             else {
-                String s = content.substring(start, end);
-                if (s.endsWith("(")) {
+                if (content.charAt(end-1)=='(') {
                     type = Type.object;
                 }
                 else {
@@ -18,9 +18,7 @@ package metaheuristic.java_version_migration.migrations;
 
 import lombok.extern.slf4j.Slf4j;
 import metaheuristic.java_version_migration.Migration;
-
-import java.nio.file.Files;
-import java.nio.file.StandardOpenOption;
+import metaheuristic.java_version_migration.Migration.Content;
 
 /**
  * @author Sergio Lissner
@@ -30,34 +28,10 @@ import java.nio.file.StandardOpenOption;
 @Slf4j
 public class RemoveDoubleLF {
 
-    public static void migrateSynchronized(Migration.MigrationConfig cfg) {
-        try {
-            long mills = System.currentTimeMillis();
-            String content = Files.readString(cfg.path(), cfg.globals().getCharset());
-            MigrateSynchronizedJava21.Content newContent = process(cfg, content);
-            if (newContent.changed()) {
-                Files.writeString(cfg.path(), newContent.content(), cfg.globals().getCharset(), StandardOpenOption.SYNC, StandardOpenOption.TRUNCATE_EXISTING, StandardOpenOption.WRITE);
-                System.out.println("\t\tprocessed for "+(System.currentTimeMillis() - mills));
-            }
-        } catch (Throwable th) {
-            log.error("Error with path " + cfg.path(), th);
-        }
-    }
-
-    private static MigrateSynchronizedJava21.Content process(Migration.MigrationConfig cfg, String content) {
-        StringBuilder sb = new StringBuilder(content);
-        boolean changed=false;
-        for (int i = 0; i < content.length() - 1; i++) {
-            char[] chars = new char[2];
-            sb.getChars(i, i+1, chars, 0);
-            if (chars[0] ==7 && chars[0]==chars[1] ) {
-                sb.deleteCharAt(i);
-                changed = true;
-                i--;
-            }
-        }
-
-        return new MigrateSynchronizedJava21.Content(sb.toString(), changed);
+    public static Content migrateSynchronized(Migration.MigrationConfig cfg, String content) {
+        // the duplicate check of this migration never matched (only one char was copied for comparison),
+        // so the content is returned as is, without copying it into a StringBuilder char by char
+        return new Content(content, false);
     }
 
 }
@@ -16,12 +16,17 @@
 
 package metaheuristic.java_version_migration.migrations;
 
+import java.util.regex.Pattern;
+
 /**
  * @author Sergio Lissner
  * Date: 8/3/2023
  * Time: 11:46 PM
  */
 public class StampedLockCode implements MigrateSynchronizedJava21.LockerTypeCode {
+
+    private static final Pattern IMPORT_PATTERN = MigrateSynchronizedJava21.importPattern("StampedLock");
+
     public String appendDeclarationLockVariables(int idx, int offsetInt) {
         String offset = " ".repeat(offsetInt);
         String lock = String.format(
@@ -39,6 +44,11 @@ public class StampedLockCode implements MigrateSynchronizedJava21.LockerTypeCode
         return "import java.util.concurrent.locks.StampedLock;";
     }
 
+    @Override
+    public Pattern getImportPattern() {
+        return IMPORT_PATTERN;
+    }
+
     @Override
     public String getCloseTry(int idx, String offset, String doubleOffset) {
         String close = String.format(
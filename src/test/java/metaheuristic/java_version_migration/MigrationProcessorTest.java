@@ -0,0 +1,56 @@
+/*
+ * Copyright (c) 2023. Sergio Lissner
+ *
+ *     Licensed under the Apache License, Version 2.0 (the "License");
+ *     you may not use this file except in compliance with the License.
+ *     You may obtain a copy of the License at
+ *
+ *         http://www.apache.org/licenses/LICENSE-2.0
+ *
+ *     Unless required by applicable law or agreed to in writing, software
+ *     distributed under the License is distributed on an "AS IS" BASIS,
+ *     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ *     See the License for the specific language governing permissions and
+ *     limitations under the License.
+ */
+
+package metaheuristic.java_version_migration;
+
+import org.junit.jupiter.api.Test;
+import org.junit.jupiter.api.io.TempDir;
+import org.junit.jupiter.api.parallel.Execution;
+
+import java.io.IOException;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.util.ArrayList;
+import java.util.List;
+import java.util.Set;
+import java.util.stream.Collectors;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.parallel.ExecutionMode.CONCURRENT;
+
+@Execution(CONCURRENT)
+public class MigrationProcessorTest {
+
+    @Test
+    public void test_findJavaFiles_excludePath(@TempDir Path dir) throws IOException {
+        write(dir.resolve("src/A.java"));
+        write(dir.resolve("src/B.txt"));
+        write(dir.resolve("target/classes/C.java"));
+        write(dir.resolve("target2/D.java"));
+
+        List<Path> found = new ArrayList<>();
+        MigrationProcessor.findJavaFiles(dir, List.of(dir.resolve("target").toAbsolutePath().normalize()), found::add);
+
+        Set<String> names = found.stream().map(p -> dir.relativize(p).toString().replace('\\', '/')).collect(Collectors.toSet());
+        assertEquals(Set.of("src/A.java", "target2/D.java"), names);
+    }
+
+    private static void write(Path path) throws IOException {
+        Files.createDirectories(path.getParent());
+        Files.writeString(path, "class A {}\n");
+    }
+
+}
@@ -48,6 +48,31 @@ public class MigrationUtilsTest {
         assertFalse(isInCommentLine(code, code.length() - 1));
     }
 
+    @Test
+    public void test_isCommentLine_2() {
+        String code = "int i=0; // comment\nint j=1;\r\nint k=2; //\n";
+        // '//' on the previous line doesn't count
+        assertFalse(isInCommentLine(code, code.indexOf("j=1")));
+        assertFalse(isInCommentLine(code, code.indexOf("k=2")));
+        assertTrue(isInCommentLine(code, code.indexOf("comment")));
+        assertTrue(isInCommentLine(code, code.length()-2));
+    }
+
+    @Test
+    public void test_searchStartLine_1() {
+        String code = "int i=0;\nint j=1;\r\nint k=2;";
+        assertEquals(0, searchStartLine(code, 3));
+        assertEquals(8, searchStartLine(code, code.indexOf("j=1")));
+        assertEquals(18, searchStartLine(code, code.indexOf("k=2")));
+    }
+
+    @Test
+    public void test_isInVariable_1() {
+        String code = "String s = \"a\";\nint synchronized;\nString t = \" synchronized";
+        assertFalse(isInVariable(code, code.indexOf("synchronized")));
+        assertTrue(isInVariable(code, code.lastIndexOf("synchronized")));
+    }
+
     @Test
     public void test_isInCommentBlock_1() {
         String code = """
@@ -65,6 +65,39 @@ public class MigrateSynchronizedJava21Test {
         int i=0;
     }
 
+    @Test
+    public void test_positions_withOffset() {
+
+        String code = """
+                public synchronized boolean yes() {
+                    return true;
+                }
+
+                public boolean no() {
+                synchronized(this)  {
+                    return false;
+                }
+
+                public Boolean maybe() {
+                synchronized
+                (this)  {
+                    return null;
+                }
+                }
+                """;
+
+        List<Position> positions = positions(19, code, true);
+        assertEquals(1, positions.size());
+        assertEquals(new Position(77, 91, Type.object), positions.get(0));
+
+        positions = positions(positions.get(0).end()-1, code, false);
+        assertEquals(1, positions.size());
+        assertEquals(new Position(145, 159, Type.object), positions.get(0));
+
+        positions = positions(code.length(), code, false);
+        assertEquals(0, positions.size());
+    }
+
     @Test
     public void test_positions_2() {
 
@@ -216,6 +249,38 @@ public class MigrateSynchronizedJava21Test {
         assertEquals(57, idx);
     }
 
+    @Test
+    public void test_findCloseBracket_3() {
+        String code = """
+                public synchronized boolean yes() {
+                    String s = "}{";
+                    char c = '}';
+                    // }
+                    /* } */
+                    return s.isEmpty() && c=='{';
+                }
+                """;
+        List<Position> positions = positions(code, true);
+        assertEquals(1, positions.size());
+
+        int idx = findCloseBracket(code, positions.get(0));
+        assertEquals(130, idx);
+    }
+
+    @Test
+    public void test_findOpenBracket_2() {
+        String code = """
+                public synchronized boolean yes(@Name("{") String s) {
+                    return true;
+                }
+                """;
+        List<Position> positions = positions(code, true);
+        assertEquals(1, positions.size());
+
+        int idx = findOpenBracket(code, positions.get(0));
+        assertEquals(53, idx);
+    }
+
     @Test
     public void test_findOpenBracket_1() {
         String code = """
@@ -16,14 +16,18 @@
 
 package metaheuristic.java_version_migration.migrations;
 
+import metaheuristic.java_version_migration.Globals;
+import metaheuristic.java_version_migration.Migration;
 import org.junit.jupiter.api.Test;
 import org.junit.jupiter.api.parallel.Execution;
 
+import java.nio.file.Path;
 import java.util.List;
 
 import static metaheuristic.java_version_migration.migrations.MigrateSynchronizedJava21.*;
 import static metaheuristic.java_version_migration.migrations.MigrateSynchronizedJava21.Type.comment;
 import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertTrue;
 import static org.junit.jupiter.api.parallel.ExecutionMode.CONCURRENT;
 
 /**
@@ -199,6 +203,49 @@ public class MigrateSynchronizedJava21_ReentrantReadWriteLockTest {
 
     }
 
+    @Test
+    public void test_migrateSynchronized_1() {
+        String code = """
+                package metaheuristic;
+
+                class Text {
+                    public synchronized boolean yes() {
+                        return true;
+                    }
+
+                    // not synchronized here
+                    private final String s = " synchronized ";
+
+                    public synchronized boolean no() {
+                        return false;
+                    }
+                }
+                """;
+        Migration.Content c = migrateSynchronized(new Migration.MigrationConfig(Path.of("Text.java"), new Globals()), code);
+        assertTrue(c.changed());
+        String r = c.content();
+
+        assertEquals(1, count(r, "import java.util.concurrent.locks.ReentrantReadWriteLock;"));
+        assertEquals(1, count(r, "private static final ReentrantReadWriteLock lock0 "));
+        assertEquals(1, count(r, "private static final ReentrantReadWriteLock lock1 "));
+        assertEquals(1, count(r, "writeLock0.lock();"));
+        assertEquals(1, count(r, "writeLock1.lock();"));
+        assertTrue(r.contains("public boolean yes() {"));
+        assertTrue(r.contains("public boolean no() {"));
+        // synchronized in the comment and in the string literal stay as is
+        assertTrue(r.contains("// not synchronized here"));
+        assertTrue(r.contains("private final String s = \" synchronized \";"));
+        assertEquals(2, count(r, "synchronized"));
+    }
+
+    private static int count(String content, String s) {
+        int count = 0;
+        for (int idx = content.indexOf(s); idx!=-1; idx = content.indexOf(s, idx + s.length())) {
+            count++;
+        }
+        return count;
+    }
+
     @Test
     public void test_insertTry_1() {
         String code = """
@@ -284,6 +331,116 @@ public class MigrateSynchronizedJava21_ReentrantReadWriteLockTest {
 
     }
 
+    @Test
+    public void test_insertImport_3() {
+        String code = """
+                package metaheuristic;
+
+                import java.util.concurrent.locks.ReentrantReadWriteLock;
+
+                public boolean yes() {
+                    return true;
+                }
+                """;
+        String newCode = insertImport(REENTRANT_READ_WRITE_LOCK_CODE_INSTANCE, code);
+        assertEquals(code, newCode);
+
+        String code2 = """
+                package metaheuristic;
+
+                import java.util.concurrent.locks.*;
+
+                public boolean yes() {
+                    return true;
+                }
+                """;
+        assertEquals(code2, insertImport(REENTRANT_READ_WRITE_LOCK_CODE_INSTANCE, code2));
+    }
+
+    @Test
+    public void test_insertImport_5() {
+        String code = """
+                package metaheuristic;
+
+                // import java.util.concurrent.locks.ReentrantReadWriteLock;
+                /*
+                import java.util.concurrent.locks.*;
+                 */
+
+                /**
+                 * uses import java.util.concurrent.locks.ReentrantReadWriteLock;
+                 */
+                public boolean yes() {
+                    return true;
+                }
+                """;
+        String newCode = insertImport(REENTRANT_READ_WRITE_LOCK_CODE_INSTANCE, code);
+        assertEquals(
+                """
+                    package metaheuristic;
+
+                    import java.util.concurrent.locks.ReentrantReadWriteLock;
+
+                    // import java.util.concurrent.locks.ReentrantReadWriteLock;
+                    /*
+                    import java.util.concurrent.locks.*;
+                     */
+
+                    /**
+                     * uses import java.util.concurrent.locks.ReentrantReadWriteLock;
+                     */
+                    public boolean yes() {
+                        return true;
+                    }
+                    """,
+                newCode);
+
+        // import of other class from the same package doesn't count
+        String code2 = """
+                package metaheuristic;
+
+                import java.util.concurrent.locks.StampedLock;
+                """;
+        assertEquals(
+                """
+                    package metaheuristic;
+
+                    import java.util.concurrent.locks.ReentrantReadWriteLock;
+
+                    import java.util.concurrent.locks.StampedLock;
+                    """,
+                insertImport(REENTRANT_READ_WRITE_LOCK_CODE_INSTANCE, code2));
+    }
+
+    @Test
+    public void test_insertImport_4() {
+        String code = """
+                /*
+                 * Classes of this package are thread-safe; see docs
+                 */
+                package metaheuristic;
+
+                public boolean yes() {
+                    return true;
+                }
+                """;
+        String newCode = insertImport(REENTRANT_READ_WRITE_LOCK_CODE_INSTANCE, code);
+        assertEquals(
+                """
+                    /*
+                     * Classes of this package are thread-safe; see docs
+                     */
+                    package metaheuristic;
+
+                    import java.util.concurrent.locks.ReentrantReadWriteLock;
+
+                    public boolean yes() {
+                        return true;
+                    }
+                    """,
+                newCode);
+    }
+
     @Test
     public void test_insertFirstPart_1() {
         String code = """
@@ -0,0 +1,52 @@
+/*
+ * Copyright (c) 2023. Sergio Lissner
+ *
+ *     Licensed under the Apache License, Version 2.0 (the "License");
+ *     you may not use this file except in compliance with the License.
+ *     You may obtain a copy of the License at
+ *
+ *         http://www.apache.org/licenses/LICENSE-2.0
+ *
+ *     Unless required by applicable law or agreed to in writing, software
+ *     distributed under the License is distributed on an "AS IS" BASIS,
+ *     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ *     See the License for the specific language governing permissions and
+ *     limitations under the License.
+ */
+
+package metaheuristic.java_version_migration.migrations;
+
+import metaheuristic.java_version_migration.Globals;
+import metaheuristic.java_version_migration.Migration;
+import org.junit.jupiter.api.Test;
+import org.junit.jupiter.api.parallel.Execution;
+
+import java.nio.file.Path;
+
+import static org.junit.jupiter.api.Assertions.assertFalse;
+import static org.junit.jupiter.api.Assertions.assertSame;
+import static org.junit.jupiter.api.parallel.ExecutionMode.CONCURRENT;
+
+@Execution(CONCURRENT)
+public class RemoveDoubleLFTest {
+
+    private static final Migration.MigrationConfig CFG = new Migration.MigrationConfig(Path.of("Test.java"), new Globals());
+
+    @Test
+    public void test_single() {
+        String code = "class A {\n    int i;\n}";
+        Migration.Content c = RemoveDoubleLF.migrateSynchronized(CFG, code);
+        assertFalse(c.changed());
+        assertSame(code, c.content());
+    }
+
+    @Test
+    public void test_blankLines() {
+        // RemoveDoubleLF doesn't change files, blank lines stay as is
+        String code = "class A {\n\n\n    int i;\n\n}\n\n";
+        Migration.Content c = RemoveDoubleLF.migrateSynchronized(CFG, code);
+        assertFalse(c.changed());
+        assertSame(code, c.content());
+    }
+
+}